@@ -1,12 +1,46 @@
-from flask import Flask, render_template, request, redirect, url_for, flash
+from flask import Flask, render_template, request, redirect, url_for, flash, get_flashed_messages, jsonify, send_file, session, stream_template
 import os
-import glob
+import re
+from dataclasses import dataclass
 from datetime import datetime
-import importlib.util
+from operator import attrgetter
+from urllib.parse import urlparse
+import heapq
 import threading
 import time
-import subprocess
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import yaml
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# orjson is an optional speedup for decoding API responses; fall back to
+# the stdlib decoder when it is not installed
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+# --- Compiled regexes ---
+# All patterns are compiled once at import time so hot paths never pay
+# the re-module cache lookup. ASCII mode skips Unicode case folding;
+# frontmatter keys and markers are ASCII by convention.
+
+# Matches the frontmatter block and the body in a single pass over bytes;
+# \r?\n keeps CRLF task files parsing like the orchestrator's parser does
+_FM_RE = re.compile(rb'\A---\r?\n(.*?)\r?\n---(?:\r?\n)?(.*)\Z', re.DOTALL)
+
+# Splits task content from an appended '## Response' section in one pass
+_RESPONSE_RE = re.compile(r'\A(.*?)\r?\n---\r?\n.*?## Response\s*(.*)\Z', re.DOTALL | re.ASCII)
+
+# Frontmatter line edits used when retrying a failed task in place
+_STATUS_LINE_RE = re.compile(rb'^status:.*$', re.MULTILINE)
+_FAILURE_REASON_LINE_RE = re.compile(rb'^failure_reason:.*\n?', re.MULTILINE)
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-change-this'
@@ -14,111 +48,234 @@ app.secret_key = 'your-secret-key-change-this'
 # Global state for orchestrator
 orchestrator_running = False
 orchestrator_thread = None
+_stop_event = threading.Event()
+# Guards start/stop transitions so concurrent requests cannot spawn two
+# orchestrator threads
+_orch_lock = threading.Lock()
+
+# Cache of parsed task files keyed by filepath, storing
+# (st_mtime_ns, st_size, metadata, preview) so unchanged files are not
+# re-read on every dashboard render
+_task_cache = {}
+_task_cache_lock = threading.Lock()
+
+# Cache of assembled task lists keyed by (directory, limit), validated
+# against a (count, max mtime, sum of mtimes) signature of the scan
+_dir_cache = {}
+
+# Pool for scanning the three task directories concurrently
+_scan_pool = ThreadPoolExecutor(max_workers=3)
+
+# Shared HTTP session so endpoint probes and repeated /create page loads
+# reuse one keep-alive connection instead of a fresh TCP+TLS handshake
+_http = requests.Session()
+_http_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.2),
+)
+_http.mount('http://', _http_adapter)
+_http.mount('https://', _http_adapter)
+
+class OpenWebUIClient:
+    """
+    Thin client for the OpenWebUI API. Precomputes the base URL and
+    request headers once per configuration and remembers the working
+    models endpoint, so per-call work is just the HTTP request itself.
+    Uses the shared pooled session.
+    """
+    def __init__(self, api_url, api_key):
+        self.key = (api_url, api_key)
+        parsed = urlparse(api_url)
+        self.base_url = f"{parsed.scheme}://{parsed.netloc}"
+        self.headers = {"Content-Type": "application/json"}
+        if api_key:
+            self.headers["Authorization"] = f"Bearer {api_key}"
+        self.session = _http
+        self.working_models_url = None
+
+_owui_client = None
+
+def _get_owui_client():
+    """Returns the client for the current config, rebuilding it on change"""
+    global _owui_client
+    cfg = load_config()
+    if not cfg['api_url']:
+        return None
+    key = (cfg['api_url'], cfg['api_key'])
+    if _owui_client is None or _owui_client.key != key:
+        _owui_client = OpenWebUIClient(cfg['api_url'], cfg['api_key'])
+    return _owui_client
+
+def _invalidate_task_cache(filepath):
+    """Drop a single file from the parse cache after create/retry/delete"""
+    with _task_cache_lock:
+        _task_cache.pop(filepath, None)
+
+# Parsed config cached by (mtime_ns, size) so repeated loads are a dict
+# lookup; the file is only re-exec'd when it actually changes
+_config_cache = {'key': None, 'data': None}
 
 # Load configuration from config.py
 def load_config():
     config_path = "config.py"
-    if not os.path.exists(config_path):
+    try:
+        st = os.stat(config_path)
+    except OSError:
         return {
+            'api_url': None,
+            'api_key': '',
             'pending_directory': './tasks/pending',
             'completed_directory': './tasks/completed',
             'failed_directory': './tasks/failed',
             'default_model': 'llama3',
             'default_workspace': 'default'
         }
-    
-    spec = importlib.util.spec_from_file_location("config", config_path)
-    config_module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(config_module)
-    
-    return {
-        'pending_directory': getattr(config_module, 'PENDING_DIRECTORY', './tasks/pending'),
-        'completed_directory': getattr(config_module, 'COMPLETED_DIRECTORY', './tasks/completed'),
-        'failed_directory': getattr(config_module, 'FAILED_DIRECTORY', './tasks/failed'),
-        'default_model': getattr(config_module, 'DEFAULT_MODEL', 'llama3'),
-        'default_workspace': getattr(config_module, 'DEFAULT_WORKSPACE', 'default'),
+
+    key = (config_path, st.st_mtime_ns, st.st_size)
+    if _config_cache['key'] == key:
+        return _config_cache['data']
+
+    # config.py is a handful of module-level assignments; a plain exec on
+    # the compiled source avoids the importlib spec/loader machinery
+    with open(config_path, 'r') as f:
+        source = f.read()
+    namespace = {}
+    exec(compile(source, config_path, 'exec'), namespace)
+
+    data = {
+        'api_url': namespace.get('API_URL'),
+        'api_key': namespace.get('API_KEY', ''),
+        'pending_directory': namespace.get('PENDING_DIRECTORY', './tasks/pending'),
+        'completed_directory': namespace.get('COMPLETED_DIRECTORY', './tasks/completed'),
+        'failed_directory': namespace.get('FAILED_DIRECTORY', './tasks/failed'),
+        'default_model': namespace.get('DEFAULT_MODEL', 'llama3'),
+        'default_workspace': namespace.get('DEFAULT_WORKSPACE', 'default'),
     }
+    _config_cache['key'] = key
+    _config_cache['data'] = data
+    return data
 
 config = load_config()
 
+# Ensure the task and log directories exist once at startup rather than
+# re-checking on every request
+for _directory in (config['pending_directory'], config['completed_directory'],
+                   config['failed_directory'], "logs"):
+    os.makedirs(_directory, exist_ok=True)
+
+# Model discovery is slow (up to four HTTP probes) and the list rarely
+# changes, so cache it briefly; a config.py change busts the cache early
+_MODELS_TTL = 60.0
+_models_cache = {'value': None, 'ts': 0.0, 'config_mtime': None}
+
 def fetch_available_models():
+    """Fetch available models, serving a short-lived cache when fresh"""
+    try:
+        config_mtime = os.path.getmtime('config.py')
+    except OSError:
+        config_mtime = None
+
+    if (_models_cache['value'] is not None
+            and _models_cache['config_mtime'] == config_mtime
+            and time.monotonic() - _models_cache['ts'] < _MODELS_TTL):
+        return _models_cache['value']
+
+    models = _fetch_models_from_api()
+
+    if models:
+        _models_cache['value'] = models
+        _models_cache['ts'] = time.monotonic()
+        _models_cache['config_mtime'] = config_mtime
+    elif _models_cache['value'] is not None:
+        # Serve stale rather than an empty dropdown on a transient failure
+        return _models_cache['value']
+
+    return models
+
+def _fetch_models_from_api():
     """Fetch available models from OpenWebUI /api/models endpoint"""
-    # Create logs directory if it doesn't exist
-    logs_dir = "logs"
-    if not os.path.exists(logs_dir):
-        os.makedirs(logs_dir)
-    
-    log_file = os.path.join(logs_dir, "model_fetch_errors.log")
+    log_file = os.path.join("logs", "model_fetch_errors.log")
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    def write_log(message):
-        """Helper to write to log file immediately"""
-        with open(log_file, 'a') as f:
-            f.write(message)
-    
+
+    # Collect log lines in memory and flush once on the way out instead
+    # of an open/write/close cycle per message
+    log_lines = []
+    write_log = log_lines.append
+
     try:
-        # Load config to get API URL and key
-        config_path = "config.py"
-        if not os.path.exists(config_path):
-            write_log(f"[{timestamp}] Error: config.py not found\n\n")
-            return []
-        
-        spec = importlib.util.spec_from_file_location("config", config_path)
-        config_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(config_module)
-        
-        api_url = getattr(config_module, 'API_URL', None)
-        api_key = getattr(config_module, 'API_KEY', '')
-        
-        if not api_url:
+        # The client carries the base URL, headers, and pooled session,
+        # all derived once from the (mtime-cached) config
+        client = _get_owui_client()
+        if client is None:
             write_log(f"[{timestamp}] Error: API_URL not configured in config.py\n\n")
             return []
-        
-        # Construct models endpoint URL
-        # API_URL might be full endpoint path (e.g., http://host/api/v1/chat/completions)
-        # We need to extract base URL and add /models or /api/models
-        from urllib.parse import urlparse
-        
-        parsed = urlparse(api_url)
-        base_url = f"{parsed.scheme}://{parsed.netloc}"
-        
-        # Prepare headers
-        headers = {
-            "Content-Type": "application/json"
-        }
-        
-        if api_key:
-            headers["Authorization"] = f"Bearer {api_key}"
-        
+
         # Try different possible model endpoint paths
         possible_endpoints = [
             "/api/models",
-            "/api/v1/models", 
+            "/api/v1/models",
             "/v1/models",
             "/models"
         ]
-        
+
+        candidate_urls = [f"{client.base_url}{endpoint}" for endpoint in possible_endpoints]
+
         models_url = None
         response = None
-        for endpoint in possible_endpoints:
-            models_url = f"{base_url}{endpoint}"
-            write_log(f"Trying endpoint: {models_url}\n")
+
+        # A previously discovered working URL gets a single direct request
+        working = client.working_models_url
+        if working:
+            write_log(f"Trying cached endpoint: {working}\n")
             try:
-                response = requests.get(models_url, headers=headers, timeout=10)
-                write_log(f"Status Code: {response.status_code}\n")
-                
-                if response.status_code == 200:
-                    write_log(f"Success! Got response from {models_url}\n")
-                    break
-                else:
-                    write_log(f"Failed (status {response.status_code}), trying next endpoint...\n")
-                    continue
+                probe = client.session.get(working, headers=client.headers, timeout=10)
+                write_log(f"Status Code: {probe.status_code}\n")
+                if probe.status_code == 200:
+                    models_url, response = working, probe
             except Exception as e:
-                write_log(f"Failed: {e}, trying next endpoint...\n")
-                continue
+                write_log(f"Cached endpoint failed: {e}\n")
+
+        if response is None:
+            # Probe every candidate concurrently; the first 200 wins and
+            # the rest are abandoned, so worst-case latency is the slowest
+            # single probe instead of the sum of all of them
+            fallback = None
+            probe_pool = ThreadPoolExecutor(max_workers=len(candidate_urls))
+            futures = {
+                probe_pool.submit(client.session.get, url,
+                                  headers=client.headers, timeout=10): url
+                for url in candidate_urls
+            }
+            try:
+                for future in as_completed(futures):
+                    url = futures[future]
+                    try:
+                        probe = future.result()
+                    except Exception as e:
+                        write_log(f"Probe {url} failed: {e}\n")
+                        continue
+                    write_log(f"Probe {url}: status {probe.status_code}\n")
+                    if probe.status_code == 200:
+                        models_url, response = url, probe
+                        break
+                    fallback = (url, probe)
+            finally:
+                probe_pool.shutdown(wait=False, cancel_futures=True)
+
+            if response is None and fallback:
+                models_url, response = fallback
+
+        if response is None:
+            client.working_models_url = None
+            write_log(f"[{timestamp}] All model endpoints unreachable\n\n")
+            return []
+
+        if response.status_code == 200:
+            write_log(f"Success! Got response from {models_url}\n")
+            client.working_models_url = models_url
         else:
-            # All endpoints failed
-            write_log(f"All endpoints failed, using last tried: {models_url}\n")
+            client.working_models_url = None
         
         # Log request details immediately
         write_log(f"[{timestamp}] Fetching models from: {models_url}\n")
@@ -135,7 +292,7 @@ def fetch_available_models():
         
         # Try to parse JSON
         try:
-            data = response.json()
+            data = _json_loads(response.content)
             write_log(f"Parsed JSON: {data}\n")
         except Exception as json_error:
             write_log(f"JSON Parse Error: {type(json_error).__name__}: {json_error}\n\n")
@@ -161,36 +318,41 @@ def fetch_available_models():
         write_log(f"[{timestamp}] Error fetching models: {type(e).__name__}: {e}\n\n")
         print(f"Error fetching models: {e}")
         return []
+    finally:
+        if log_lines:
+            with open(log_file, 'a') as f:
+                f.writelines(log_lines)
 
 def run_orchestrator():
     """Background thread to run orchestrator every 5 minutes"""
     global orchestrator_running
+    # Imported lazily so the dashboard can start even if the orchestrator
+    # module fails to import (e.g. missing config)
+    import orchestrator
     while orchestrator_running:
         try:
-            subprocess.run(['python3', 'orchestrator.py'], check=True, capture_output=True)
-        except subprocess.CalledProcessError as e:
-            print(f"Orchestrator error: {e}")
+            orchestrator.run_once()
         except Exception as e:
-            print(f"Unexpected error: {e}")
-        
-        # Wait 5 minutes before next run (300 seconds)
-        for _ in range(300):
-            if not orchestrator_running:
-                break
-            time.sleep(1)
+            print(f"Orchestrator error: {e}")
+
+        # Wait 5 minutes before next run; returns immediately on stop
+        if _stop_event.wait(timeout=300):
+            break
 
 @app.route('/orchestrator/start')
 def start_orchestrator():
     """Start orchestrator background thread"""
     global orchestrator_running, orchestrator_thread
-    
-    if orchestrator_running:
-        flash('Orchestrator is already running!', 'error')
-        return redirect(url_for('index'))
-    
-    orchestrator_running = True
-    orchestrator_thread = threading.Thread(target=run_orchestrator, daemon=True)
-    orchestrator_thread.start()
+
+    with _orch_lock:
+        if orchestrator_running:
+            flash('Orchestrator is already running!', 'error')
+            return redirect(url_for('index'))
+
+        orchestrator_running = True
+        _stop_event.clear()
+        orchestrator_thread = threading.Thread(target=run_orchestrator, daemon=True)
+        orchestrator_thread.start()
     flash('Orchestrator started! Will run every 5 minutes.', 'success')
     return redirect(url_for('index'))
 
@@ -198,31 +360,51 @@ def start_orchestrator():
 def stop_orchestrator():
     """Stop orchestrator background thread"""
     global orchestrator_running
-    
-    if not orchestrator_running:
-        flash('Orchestrator is not running!', 'error')
-        return redirect(url_for('index'))
-    
-    orchestrator_running = False
+
+    with _orch_lock:
+        if not orchestrator_running:
+            flash('Orchestrator is not running!', 'error')
+            return redirect(url_for('index'))
+
+        orchestrator_running = False
+        _stop_event.set()
     flash('Orchestrator stopped!', 'success')
     return redirect(url_for('index'))
 
-def parse_frontmatter(filepath):
-    """Parse markdown file with frontmatter and separate response if present"""
-    with open(filepath, 'r') as f:
-        content = f.read()
-    
-    if not content.startswith('---'):
-        return {}, content
-    
-    parts = content.split('---', 2)
-    
-    if len(parts) < 3:
-        return {}, content
-    
-    frontmatter_text = parts[1].strip()
-    body = parts[2]
-    
+def _read_bytes(path, size):
+    """
+    Reads up to size bytes via the raw os interface, skipping the io
+    module's TextIOWrapper/BufferedReader layers and their per-open
+    buffer allocations.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+def _read_file_bytes(path):
+    """Reads a whole file via the raw os interface"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size)
+        # A single read normally returns everything for regular files;
+        # loop just in case it comes back short
+        while len(data) < size:
+            chunk = os.read(fd, size - len(data))
+            if not chunk:
+                break
+            data += chunk
+        return data
+    finally:
+        os.close(fd)
+
+def parse_metadata_lines(frontmatter_text):
+    """
+    Parse the key/value lines of a frontmatter block into a dict.
+    Fallback for blocks that PyYAML cannot handle.
+    """
     metadata = {}
     for line in frontmatter_text.split('\n'):
         line = line.strip()
@@ -230,91 +412,281 @@ def parse_frontmatter(filepath):
             key, value = line.split(':', 1)
             key = key.strip().lower()
             value = value.strip()
-            
+
             if value.startswith('"') and value.endswith('"'):
                 value = value[1:-1]
             elif value.startswith("'") and value.endswith("'"):
                 value = value[1:-1]
-            
+
             metadata[key] = value
-    
+
+    return metadata
+
+def parse_frontmatter_block(frontmatter_text):
+    """Parse a frontmatter block with the C-accelerated YAML loader"""
+    if ':' not in frontmatter_text:
+        return {}
+
+    try:
+        metadata = yaml.load(frontmatter_text, Loader=_YamlLoader)
+    except yaml.YAMLError:
+        return parse_metadata_lines(frontmatter_text)
+
+    if not isinstance(metadata, dict):
+        return {}
+
+    return {str(key).lower(): value for key, value in metadata.items()}
+
+def parse_frontmatter(filepath):
+    """Parse markdown file with frontmatter and separate response if present"""
+    data = _read_file_bytes(filepath)
+
+    match = _FM_RE.match(data)
+    if not match:
+        return {}, data.decode('utf-8', errors='replace')
+
+    metadata = parse_frontmatter_block(match.group(1).decode('utf-8', errors='replace'))
+    body = match.group(2).decode('utf-8', errors='replace')
+
     return metadata, body
 
-def write_frontmatter(filepath, metadata, content, response=None):
-    """Writes a markdown file with frontmatter"""
-    # Convert metadata to frontmatter format
-    frontmatter_lines = []
-    for key, value in metadata.items():
-        if isinstance(value, str):
-            frontmatter_lines.append(f'{key}: "{value}"')
-        else:
-            frontmatter_lines.append(f'{key}: {value}')
-    
-    frontmatter_text = '\n'.join(frontmatter_lines)
-    
-    # Construct the file content
-    full_content = f"---\n{frontmatter_text}\n---\n\n{content}"
-    
-    # Append response if provided
-    if response:
-        full_content += f"\n\n---\n\n## Response\n\n{response}\n"
-    
-    with open(filepath, 'w') as f:
-        f.write(full_content)
+def parse_frontmatter_preview(filepath, preview_bytes=8192):
+    """
+    Parse metadata and a short body preview without reading the whole file.
+    Reads only the first preview_bytes of the file, which is plenty for the
+    frontmatter block plus the 200-character preview shown on the dashboard.
+    """
+    chunk = _read_bytes(filepath, preview_bytes)
+
+    match = _FM_RE.match(chunk)
+    if not match:
+        return {}, chunk.decode('utf-8', errors='replace')[:201]
+
+    metadata = parse_frontmatter_block(match.group(1).decode('utf-8', errors='replace'))
+    preview = match.group(2).decode('utf-8', errors='replace').strip()[:201]
 
-def get_tasks_from_directory(directory):
-    """Get all tasks from a directory"""
+    return metadata, preview
+
+@dataclass(slots=True)
+class Task:
+    """Compact per-task record handed to the dashboard templates"""
+    filename: str
+    filepath: str
+    metadata: dict
+    content: str
+    modified: datetime
+    status: str
+    model: str
+    workspace: str
+
+def get_tasks_from_directory(directory, limit=50):
+    """
+    Get the newest tasks from a directory. Only the top `limit` entries
+    by mtime are parsed; pass limit=None to materialize everything.
+    """
     tasks = []
     if not os.path.exists(directory):
         return tasks
-    
-    for filepath in glob.glob(os.path.join(directory, '*.md')):
-        filename = os.path.basename(filepath)
-        metadata, content = parse_frontmatter(filepath)
-        
-        # Get file modification time
-        mod_time = datetime.fromtimestamp(os.path.getmtime(filepath))
-        
-        task = {
-            'filename': filename,
-            'filepath': filepath,
-            'metadata': metadata,
-            'content': content[:200] + '...' if len(content) > 200 else content,
-            'full_content': content,
-            'modified': mod_time,
-            'status': metadata.get('status', 'pending'),
-            'model': metadata.get('model', config['default_model']),
-            'workspace': metadata.get('workspace', config['default_workspace'])
-        }
-        tasks.append(task)
-    
-    # Sort by modification time (newest first)
-    tasks.sort(key=lambda x: x['modified'], reverse=True)
+
+    # Hoist the per-task fallbacks out of the loop
+    default_model = config['default_model']
+    default_workspace = config['default_workspace']
+
+    # Stat-only pass: collect (mtime_ns, stat, entry) for every task file
+    pairs = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.name.endswith('.md') or entry.name.startswith('.'):
+                continue
+            if not entry.is_file(follow_symlinks=False):
+                continue
+
+            # DirEntry caches the stat result, so this avoids a second syscall
+            st = entry.stat()
+            pairs.append((st.st_mtime_ns, st, entry))
+
+    # If the directory signature is unchanged since the last scan, the
+    # previously assembled list is still valid — skip rebuilding it
+    signature = (
+        len(pairs),
+        max((pair[0] for pair in pairs), default=0),
+        sum(pair[0] for pair in pairs),
+    )
+    cached_list = _dir_cache.get((directory, limit))
+    if cached_list and cached_list[0] == signature:
+        return cached_list[1]
+
+    # Pick the newest N with a heap instead of sorting and parsing everything
+    if limit is not None and len(pairs) > limit:
+        pairs = heapq.nlargest(limit, pairs, key=lambda pair: pair[0])
+
+    for _, st, entry in pairs:
+        # Reuse the cached parse if the file is unchanged
+        with _task_cache_lock:
+            cached = _task_cache.get(entry.path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            metadata, preview = cached[2], cached[3]
+        else:
+            metadata, preview = parse_frontmatter_preview(entry.path)
+            with _task_cache_lock:
+                _task_cache[entry.path] = (st.st_mtime_ns, st.st_size, metadata, preview)
+
+        mod_time = datetime.fromtimestamp(st.st_mtime)
+
+        tasks.append(Task(
+            filename=entry.name,
+            filepath=entry.path,
+            metadata=metadata,
+            content=preview[:200] + '...' if len(preview) > 200 else preview,
+            modified=mod_time,
+            status=metadata.get('status', 'pending'),
+            model=metadata.get('model', default_model),
+            workspace=metadata.get('workspace', default_workspace),
+        ))
+
+    # Sort by modification time (newest first); attrgetter is a C-level
+    # callable, so no Python frame per comparison key
+    tasks.sort(key=attrgetter('modified'), reverse=True)
+    _dir_cache[(directory, limit)] = (signature, tasks)
     return tasks
 
+def _scan_task_dirs():
+    """
+    Single stat-only pass over the three task directories. Returns
+    (counts, etag): per-category .md file counts, and a weak ETag derived
+    from the newest mtime seen (None if any directory is unreadable).
+    Counting and change detection share one scandir per directory so the
+    dashboard never walks the tree twice for bookkeeping.
+    """
+    counts = {}
+    newest = 0
+    readable = True
+    for category in ('pending', 'completed', 'failed'):
+        directory = config[f'{category}_directory']
+        count = 0
+        try:
+            newest = max(newest, os.stat(directory).st_mtime_ns)
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.md') and not entry.name.startswith('.'):
+                        count += 1
+                        newest = max(newest, entry.stat().st_mtime_ns)
+        except OSError:
+            readable = False
+        counts[category] = count
+    return counts, (str(newest) if readable else None)
+
+# Refresh the scan caches out-of-band so request latency stays
+# independent of directory size: by the time a request arrives, the
+# per-file and per-directory caches are already warm and the render is
+# a pure in-memory pass. The mtime signatures make each refresh cheap
+# when nothing has changed.
+_SNAPSHOT_INTERVAL = 2.0
+
+def _snapshot_refresher():
+    while True:
+        try:
+            for category in ('pending', 'completed', 'failed'):
+                get_tasks_from_directory(config[f'{category}_directory'])
+        except Exception as e:
+            print(f"Snapshot refresh error: {e}")
+        time.sleep(_SNAPSHOT_INTERVAL)
+
+_snapshot_thread = threading.Thread(target=_snapshot_refresher, daemon=True)
+_snapshot_thread.start()
+
 @app.route('/')
 def index():
     """Main dashboard"""
-    pending_tasks = get_tasks_from_directory(config['pending_directory'])
-    completed_tasks = get_tasks_from_directory(config['completed_directory'])
-    failed_tasks = get_tasks_from_directory(config['failed_directory'])
-    
-    # Calculate statistics
+    # Cheap 304 fast path: skip scanning and rendering when the client
+    # already has the current version. The page also renders orchestrator
+    # state, so that goes into the ETag, and flashed messages must render
+    # now rather than sit queued behind a 304.
+    counts, etag = _scan_task_dirs()
+    page_etag = f"{etag}-{'run' if orchestrator_running else 'stop'}" if etag else None
+    if page_etag and '_flashes' not in session and request.if_none_match.contains_weak(page_etag):
+        return '', 304
+
+    # Show the newest 50 per section unless the full view was requested
+    show_all = request.args.get('all') == '1'
+    limit = None if show_all else 50
+
+    # The three scans are independent and I/O-bound, so overlap them
+    futures = {
+        category: _scan_pool.submit(get_tasks_from_directory, config[f'{category}_directory'], limit)
+        for category in ('pending', 'completed', 'failed')
+    }
+    pending_tasks = futures['pending'].result()
+    completed_tasks = futures['completed'].result()
+    failed_tasks = futures['failed'].result()
+
+    # Statistics come from the stat-only pass, not the trimmed lists
+    pending_count = counts['pending']
+    completed_count = counts['completed']
+    failed_count = counts['failed']
+
     stats = {
-        'total': len(pending_tasks) + len(completed_tasks) + len(failed_tasks),
-        'pending': len(pending_tasks),
-        'completed': len(completed_tasks),
-        'failed': len(failed_tasks),
-        'success_rate': round((len(completed_tasks) / (len(completed_tasks) + len(failed_tasks)) * 100), 1) 
-                       if (len(completed_tasks) + len(failed_tasks)) > 0 else 0
+        'total': pending_count + completed_count + failed_count,
+        'pending': pending_count,
+        'completed': completed_count,
+        'failed': failed_count,
+        'success_rate': round((completed_count / (completed_count + failed_count) * 100), 1)
+                       if (completed_count + failed_count) > 0 else 0
     }
     
-    return render_template('index.html', 
-                          stats=stats,
-                          pending_tasks=pending_tasks,
-                          completed_tasks=completed_tasks,
-                          failed_tasks=failed_tasks,
-                          orchestrator_running=orchestrator_running)
+    # Consume flashes before streaming starts: the session cookie is
+    # serialized when the response begins, so popping them mid-stream
+    # (as base.html otherwise would) never persists. Flask caches the
+    # popped messages on the request context for the template to render.
+    get_flashed_messages(with_categories=True)
+
+    # Stream the template so the response starts before the full HTML
+    # string is materialized; matters when task lists are long
+    response = app.response_class(stream_template('index.html',
+                                  stats=stats,
+                                  pending_tasks=pending_tasks,
+                                  completed_tasks=completed_tasks,
+                                  failed_tasks=failed_tasks,
+                                  show_all=show_all,
+                                  task_limit=limit,
+                                  orchestrator_running=orchestrator_running))
+    if page_etag:
+        response.set_etag(page_etag, weak=True)
+    return response
+
+@app.route('/tasks.json')
+def tasks_json():
+    """
+    Compact JSON view of the task lists for client-side rendering or
+    polling. Serves 304s off the same stat-based ETag as the dashboard,
+    and carries only the small per-task fields (no content previews).
+    """
+    counts, etag = _scan_task_dirs()
+    if etag and request.if_none_match.contains_weak(etag):
+        return '', 304
+
+    limit = request.args.get('limit', default=50, type=int)
+    if limit <= 0:
+        limit = None
+
+    payload = {'stats': counts}
+    for category in ('pending', 'completed', 'failed'):
+        tasks = get_tasks_from_directory(config[f'{category}_directory'], limit)
+        payload[category] = [
+            {
+                'filename': task.filename,
+                'status': task.status,
+                'model': task.model,
+                'workspace': task.workspace,
+                'modified': task.modified.isoformat(),
+            }
+            for task in tasks
+        ]
+
+    response = jsonify(payload)
+    if etag:
+        response.set_etag(etag, weak=True)
+    return response
 
 @app.route('/task/<category>/<filename>')
 def view_task(category, filename):
@@ -337,25 +709,14 @@ def view_task(category, filename):
     metadata, body = parse_frontmatter(filepath)
     mod_time = datetime.fromtimestamp(os.path.getmtime(filepath))
     
-    # Separate response from content if it exists
-    response = None
-    content = body
-    
-    # Check if there's a response section separated by ---
-    if '\n---\n' in body and '## Response' in body:
-        # Split on the third --- which separates task content from response
-        # We look for the separator that comes before the Response heading
-        body_parts = body.split('\n---\n', 1)
-        if len(body_parts) > 1:
-            # First part is the task content
-            content = body_parts[0].strip()
-            # Second part contains the response section
-            response_part = body_parts[1]
-            # Find the Response heading and get everything after it
-            response_idx = response_part.find('## Response')
-            if response_idx != -1:
-                # Get everything after the Response heading
-                response = response_part[response_idx + len('## Response'):].strip()
+    # Separate response from content if it exists, in a single scan
+    match = _RESPONSE_RE.match(body)
+    if match:
+        content = match.group(1).strip()
+        response = match.group(2).strip()
+    else:
+        content = body
+        response = None
     
     task = {
         'filename': filename,
@@ -368,6 +729,27 @@ def view_task(category, filename):
     
     return render_template('view_task.html', task=task)
 
+@app.route('/task/<category>/<filename>/raw')
+def view_task_raw(category, filename):
+    """Serve the raw markdown file, letting Werkzeug use sendfile()"""
+    if category == 'pending':
+        directory = config['pending_directory']
+    elif category == 'completed':
+        directory = config['completed_directory']
+    elif category == 'failed':
+        directory = config['failed_directory']
+    else:
+        flash('Invalid category', 'error')
+        return redirect(url_for('index'))
+
+    filepath = os.path.join(directory, filename)
+    if not os.path.exists(filepath):
+        flash('Task not found', 'error')
+        return redirect(url_for('index'))
+
+    # conditional=True adds Range and If-Modified-Since support for free
+    return send_file(filepath, mimetype='text/markdown', conditional=True)
+
 @app.route('/create', methods=['GET', 'POST'])
 def create_task():
     """Create a new task"""
@@ -405,15 +787,12 @@ status: "pending"
 
 {acceptance_criteria}"""
         
-        # Ensure directory exists
-        if not os.path.exists(config['pending_directory']):
-            os.makedirs(config['pending_directory'])
-        
         # Write task file
         filepath = os.path.join(config['pending_directory'], filename)
         try:
             with open(filepath, 'w') as f:
                 f.write(frontmatter)
+            _invalidate_task_cache(filepath)
             flash(f'Task "{filename}" created successfully!', 'success')
             return redirect(url_for('index'))
         except Exception as e:
@@ -429,37 +808,53 @@ def retry_task(filename):
     """Retry a failed task by copying it to pending directory"""
     failed_directory = config['failed_directory']
     pending_directory = config['pending_directory']
-    
-    # Ensure pending directory exists
-    if not os.path.exists(pending_directory):
-        os.makedirs(pending_directory)
-    
+
     source_path = os.path.join(failed_directory, filename)
     
     if not os.path.exists(source_path):
         flash('Task not found in failed directory', 'error')
         return redirect(url_for('index'))
     
-    # Read the failed task
-    metadata, content = parse_frontmatter(source_path)
-    
-    # Update status to pending
-    metadata['status'] = 'pending'
-    
-    # Remove any failure reason from metadata
-    if 'failure_reason' in metadata:
-        del metadata['failure_reason']
-    
+    # Read the failed task once as raw bytes; the only edits needed are
+    # inside the frontmatter block, so skip the parse + re-serialize round-trip
+    with open(source_path, 'rb') as f:
+        data = f.read()
+
+    # The opening delimiter may end in LF or CRLF; keep whichever the
+    # file uses. find(b'\n---') also spots a CRLF end delimiter since
+    # b'\r\n---' contains it.
+    if data.startswith(b'---\n'):
+        fm_start = 4
+    elif data.startswith(b'---\r\n'):
+        fm_start = 5
+    else:
+        fm_start = -1
+    fm_end = data.find(b'\n---', fm_start) if fm_start != -1 else -1
+
+    if fm_end != -1:
+        frontmatter = data[fm_start:fm_end]
+        frontmatter = _FAILURE_REASON_LINE_RE.sub(b'', frontmatter, count=1)
+        if _STATUS_LINE_RE.search(frontmatter):
+            frontmatter = _STATUS_LINE_RE.sub(b'status: "pending"', frontmatter, count=1)
+        else:
+            frontmatter += b'\nstatus: "pending"'
+        data = data[:fm_start] + frontmatter + data[fm_end:]
+    else:
+        # No frontmatter block; prepend a minimal one
+        data = b'---\nstatus: "pending"\n---\n\n' + data
+
     # Create new filename with retry timestamp
     base_name = filename.replace('.md', '')
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     new_filename = f"{base_name}_retry_{timestamp}.md"
-    
-    # Write to pending directory
+
+    # Write to pending directory in a single exclusive-create write
     destination_path = os.path.join(pending_directory, new_filename)
-    
+
     try:
-        write_frontmatter(destination_path, metadata, content)
+        with open(destination_path, 'xb') as f:
+            f.write(data)
+        _invalidate_task_cache(destination_path)
         flash(f'Task "{filename}" has been retried as "{new_filename}" and moved to pending!', 'success')
     except Exception as e:
         flash(f'Error retrying task: {str(e)}', 'error')
@@ -483,6 +878,7 @@ def delete_task(category, filename):
     if os.path.exists(filepath):
         try:
             os.remove(filepath)
+            _invalidate_task_cache(filepath)
             flash(f'Task "{filename}" deleted successfully!', 'success')
         except Exception as e:
             flash(f'Error deleting task: {str(e)}', 'error')
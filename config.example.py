@@ -13,8 +13,10 @@ DEFAULT_WORKSPACE = "default"
 # Directory Configuration
 TASKS_DIRECTORY = "./tasks"
 PENDING_DIRECTORY = "./tasks/pending"
+IN_PROGRESS_DIRECTORY = "./tasks/in_progress"
 COMPLETED_DIRECTORY = "./tasks/completed"
 FAILED_DIRECTORY = "./tasks/failed"
 
 # Request Configuration
 REQUEST_TIMEOUT = 300  # seconds to wait for API response
+MAX_WORKERS = 4  # concurrent tasks processed per orchestrator pass
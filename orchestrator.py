@@ -1,42 +1,162 @@
 import os
+import re
 import time
 import hashlib
-import requests
-from requests.exceptions import RequestException
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from orjson import dumps as _dumps, loads as _loads  # C JSON codec
+except ImportError:
+    import json as _json_stdlib
+
+    def _dumps(obj):
+        return _json_stdlib.dumps(obj).encode('utf-8')
+
+    _loads = _json_stdlib.loads
+
+# requests and yaml are imported lazily: a pass with no config or no
+# pending tasks exits without paying their import cost (~100 ms combined)
+_session = None
+_session_lock = threading.Lock()
+_yaml = None
+_yaml_loader = None
+
+def _get_session():
+    """
+    Builds the shared HTTP session on first use so every task's worker
+    and evaluator calls reuse keep-alive connections instead of a fresh
+    TCP+TLS handshake per request.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+                session = requests.Session()
+                # allowed_methods must include POST explicitly: urllib3
+                # skips it by default, so 502/503 blips would otherwise
+                # mark tasks FAILED and force a full manual re-run
+                adapter = HTTPAdapter(
+                    pool_connections=16,
+                    pool_maxsize=64,
+                    max_retries=Retry(
+                        total=3,
+                        backoff_factor=0.5,
+                        status_forcelist=[502, 503, 504],
+                        allowed_methods=['POST'],
+                    ),
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
+def _get_yaml():
+    """
+    Imports PyYAML on first use, preferring the libyaml C loader.
+    Returns the (module, loader) pair.
+    """
+    global _yaml, _yaml_loader
+    if _yaml is None:
+        import yaml
+        try:
+            from yaml import CSafeLoader as loader  # libyaml C binding
+        except ImportError:
+            from yaml import SafeLoader as loader
+        _yaml, _yaml_loader = yaml, loader
+    return _yaml, _yaml_loader
+
+# Short task-id suffix appended by move_to_completed/move_to_failed
+_HASH_SUFFIX_RE = re.compile(r'_[a-f0-9]{6}$')
+
+# Digest of the last content written per path; lets write_frontmatter
+# skip rewriting files whose serialized form has not changed
+_write_cache = {}
+
+# Directories already created this process; repeated passes skip the syscall
+_ensured_dirs = set()
+
+# Formatted timestamp cached per whole second; localtime touches tzdata
+# on every call, which adds up when tasks finish in bursts
+_ts_cache = [0, ""]
+
+def _now_str():
+    now = int(time.time())
+    if _ts_cache[0] != now:
+        _ts_cache[0] = now
+        _ts_cache[1] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+    return _ts_cache[1]
+
+def _ensure_dir(directory):
+    if directory in _ensured_dirs:
+        return
+    os.makedirs(directory, exist_ok=True)
+    _ensured_dirs.add(directory)
+
+# Fenced ```json block, tried before the bare-brace fallback so prose
+# containing '{' ahead of the fence cannot shadow the real payload
+_JSON_FENCE_RE = re.compile(r'```json\s*(\{.*?\})\s*```', re.DOTALL)
+_JSON_BRACE_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# Delimited frontmatter block at the start of a file, matched on raw bytes
+_FM_BLOCK_RE = re.compile(rb'\A---\r?\n(.*?)\r?\n---(?:\r?\n|\Z)', re.DOTALL)
 
 # --- CONFIGURATION LOADING ---
 config = None
+_config_key = None  # (path, mtime_ns, size) of the file backing `config`
+_config_lock = threading.Lock()  # pool workers call get_config concurrently
 
 def load_config(config_path="config.py"):
     """
     Loads configuration from a Python file.
     Returns a dictionary with configuration values.
     """
-    global config
-    
-    if not os.path.exists(config_path):
+    try:
+        stat = os.stat(config_path)
+    except OSError:
         print(f"Error: Config file '{config_path}' not found.")
         print(f"Please copy 'config.example.py' to 'config.py' and configure your settings.")
         return None
-    
+
+    # Serve the cached dictionary unless the file changed on disk
+    cache_key = (config_path, stat.st_mtime_ns, stat.st_size)
+    if config is not None and cache_key == _config_key:
+        return config
+
+    with _config_lock:
+        # Another worker may have reloaded while we waited on the lock
+        if config is not None and cache_key == _config_key:
+            return config
+        return _load_config_locked(config_path, cache_key)
+
+def _load_config_locked(config_path, cache_key):
+    global config, _config_key
     try:
-        # Import the config module
-        import importlib.util
-        spec = importlib.util.spec_from_file_location("config", config_path)
-        config_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(config_module)
-        
+        # Execute the config source directly; config.py is a handful of
+        # module-level assignments, so full importlib machinery (spec,
+        # module object, sys.modules registration) is overhead
+        with open(config_path, 'r') as f:
+            source = f.read()
+        namespace = {}
+        exec(compile(source, config_path, 'exec'), namespace)
+
         # Extract configuration as dictionary
         loaded_config = {
-            'api_url': getattr(config_module, 'API_URL', None),
-            'api_key': getattr(config_module, 'API_KEY', ''),
-            'tasks_directory': getattr(config_module, 'TASKS_DIRECTORY', './tasks'),
-            'pending_directory': getattr(config_module, 'PENDING_DIRECTORY', './tasks/pending'),
-            'completed_directory': getattr(config_module, 'COMPLETED_DIRECTORY', './tasks/completed'),
-            'failed_directory': getattr(config_module, 'FAILED_DIRECTORY', './tasks/failed'),
-            'request_timeout': getattr(config_module, 'REQUEST_TIMEOUT', 300),
-            'default_model': getattr(config_module, 'DEFAULT_MODEL', 'llama3'),
-            'default_workspace': getattr(config_module, 'DEFAULT_WORKSPACE', None),
+            'api_url': namespace.get('API_URL'),
+            'api_key': namespace.get('API_KEY', ''),
+            'tasks_directory': namespace.get('TASKS_DIRECTORY', './tasks'),
+            'pending_directory': namespace.get('PENDING_DIRECTORY', './tasks/pending'),
+            'in_progress_directory': namespace.get('IN_PROGRESS_DIRECTORY', './tasks/in_progress'),
+            'completed_directory': namespace.get('COMPLETED_DIRECTORY', './tasks/completed'),
+            'failed_directory': namespace.get('FAILED_DIRECTORY', './tasks/failed'),
+            'request_timeout': namespace.get('REQUEST_TIMEOUT', 300),
+            'default_model': namespace.get('DEFAULT_MODEL', 'llama3'),
+            'default_workspace': namespace.get('DEFAULT_WORKSPACE'),
+            'max_workers': namespace.get('MAX_WORKERS', 4),
         }
         
         # Validate required configuration
@@ -47,6 +167,7 @@ def load_config(config_path="config.py"):
                 return None
         
         config = loaded_config
+        _config_key = cache_key
         return config
     except Exception as e:
         print(f"Error loading config file: {e}")
@@ -55,26 +176,24 @@ def load_config(config_path="config.py"):
 def get_config():
     """
     Returns the loaded configuration dictionary.
-    Loads config if not already loaded.
+    Loads config if not already loaded and reloads it when
+    config.py changes on disk (one stat call, no re-import).
     """
-    global config
-    if config is None:
-        config = load_config()
-    return config
+    return load_config()
 
 def parse_frontmatter(filepath):
     """
     Parses a markdown file with frontmatter.
     Returns a tuple (metadata, content).
     """
-    with open(filepath, 'r') as f:
-        content = f.read()
-    
-    # Check if file has frontmatter (starts with ---)
-    if not content.startswith('---'):
-        # No frontmatter, return empty metadata and full content
-        return {}, content
-    
+    with open(filepath, 'rb') as f:
+        # Peek the delimiter before committing to a full read; files
+        # without frontmatter skip the startswith scan entirely
+        head = f.read(3)
+        if head != b'---':
+            return {}, (head + f.read()).decode('utf-8')
+        content = '---' + f.read().decode('utf-8')
+
     # Find the end of frontmatter (second ---)
     parts = content.split('---', 2)
     
@@ -84,11 +203,21 @@ def parse_frontmatter(filepath):
     
     frontmatter_text = parts[1].strip()
     body = parts[2].strip()
-    
-    # Parse simple frontmatter
+
+    # Parse the frontmatter block with libyaml; handles quoting, nesting
+    # (completion_criteria) and scalars in C instead of a Python line loop
+    yaml, yaml_loader = _get_yaml()
+    try:
+        loaded = yaml.load(frontmatter_text, Loader=yaml_loader)
+        if isinstance(loaded, dict):
+            return {str(key).lower(): value for key, value in loaded.items()}, body
+    except yaml.YAMLError:
+        pass
+
+    # Fallback: simple line-based parsing for non-YAML frontmatter
     metadata = {}
     try:
-        for line in frontmatter_text.split('\n'):
+        for line in frontmatter_text.splitlines():
             line = line.strip()
             if ':' in line:
                 key, value = line.split(':', 1)
@@ -114,57 +243,117 @@ def parse_frontmatter(filepath):
     
     return metadata, body
 
+def parse_frontmatter_meta_only(filepath, preview_bytes=16384):
+    """
+    Parses only the frontmatter block of a markdown file from one
+    bounded binary read. Used for status triage where the body (and
+    any large appended response from a previous run) is irrelevant:
+    only the frontmatter slice is ever decoded.
+    """
+    with open(filepath, 'rb') as f:
+        chunk = f.read(preview_bytes)
+
+    match = _FM_BLOCK_RE.match(chunk)
+    if not match:
+        # No frontmatter, or a block larger than the preview window
+        return {}
+
+    yaml, yaml_loader = _get_yaml()
+    try:
+        loaded = yaml.load(match.group(1).decode('utf-8'), Loader=yaml_loader)
+        if isinstance(loaded, dict):
+            return {str(key).lower(): value for key, value in loaded.items()}
+    except (yaml.YAMLError, UnicodeDecodeError):
+        pass
+    return {}
+
 def write_frontmatter(filepath, metadata, content, response=None):
     """
     Writes a markdown file with frontmatter.
     Optionally appends a response section at bottom.
+    The content goes to a temp file in the same directory first and is
+    renamed into place with os.replace, so a crash mid-write never
+    leaves a half-written task file. Writes whose content matches the
+    last write to the same path are skipped entirely.
     """
-    # Convert metadata to frontmatter format
-    frontmatter_lines = []
+    # Build the file as a list of segments; writelines streams them out
+    # without ever concatenating one giant string
+    parts = ['---\n']
     for key, value in metadata.items():
         if isinstance(value, str):
-            frontmatter_lines.append(f'{key}: "{value}"')
+            parts.append(f'{key}: "{value}"\n')
         else:
-            frontmatter_lines.append(f'{key}: {value}')
-    
-    frontmatter_text = '\n'.join(frontmatter_lines)
-    
-    # Construct the file content
-    full_content = f"---\n{frontmatter_text}\n---\n\n{content}"
-    
+            parts.append(f'{key}: {value}\n')
+    parts += ['---\n\n', content]
+
     # Append response if provided
     if response:
-        full_content += f"\n\n---\n\n## Response\n\n{response}\n"
-    
-    with open(filepath, 'w') as f:
-        f.write(full_content)
+        parts += ['\n\n---\n\n## Response\n\n', response, '\n']
 
-def check_completion_criteria(response_text, criteria):
+    # Encode each segment once; the same bytes feed the digest check
+    # and the write, with no TextIOWrapper re-encoding pass
+    encoded = [part.encode('utf-8') for part in parts]
+
+    # Skip the disk write when the serialized content is unchanged
+    hasher = hashlib.blake2b(digest_size=16)
+    for chunk in encoded:
+        hasher.update(chunk)
+    digest = hasher.digest()
+    if _write_cache.get(filepath) == digest:
+        return
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(filepath) or '.', suffix='.tmp')
+    try:
+        try:
+            # One pre-joined payload, one write syscall on the raw fd
+            os.write(fd, b''.join(encoded))
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    _write_cache[filepath] = digest
+
+def compile_criteria(criteria):
     """
-    Evaluates the LLM response against the criteria defined in the markdown file.
+    Compiles completion criteria into a predicate over the response
+    text. The isinstance dispatch and needle lowercasing happen once
+    here instead of inside every check.
     """
     if not criteria:
         # If no criteria, assume completion if we got a response
-        return True
+        return lambda response_text: True
 
     if isinstance(criteria, str):
         # Simple string match (legacy support)
-        return criteria.lower() in response_text.lower()
-    
+        needle = criteria.lower()
+        return lambda response_text: needle in response_text.lower()
+
     if isinstance(criteria, dict):
-        # Check for 'contains' string
-        if 'contains' in criteria:
-            if criteria['contains'].lower() not in response_text.lower():
+        needle = criteria['contains'].lower() if 'contains' in criteria else None
+        min_length = criteria.get('min_length')
+
+        def predicate(response_text):
+            # Length first: it is free and skips the lowercased copy
+            if min_length is not None and len(response_text) < min_length:
                 return False
-        
-        # Check for 'min_length'
-        if 'min_length' in criteria:
-            if len(response_text) < criteria['min_length']:
+            if needle is not None and needle not in response_text.lower():
                 return False
-        
-        return True
+            return True
 
-    return False
+        return predicate
+
+    return lambda response_text: False
+
+def check_completion_criteria(response_text, criteria):
+    """
+    Evaluates the LLM response against the criteria defined in the markdown file.
+    """
+    return compile_criteria(criteria)(response_text)
 
 def submit_to_openwebui(model, content, workspace_id=None):
     """
@@ -173,12 +362,12 @@ def submit_to_openwebui(model, content, workspace_id=None):
     - content: The response message content (or None on error)
     - log_data: Dictionary with detailed logging information (or None on success)
     """
-    import json
-    
+    from requests.exceptions import RequestException
+
     cfg = get_config()
     if cfg is None:
         error_log = {
-            'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'timestamp': _now_str(),
             'stage': 'Configuration',
             'error': 'Configuration not loaded'
         }
@@ -203,38 +392,31 @@ def submit_to_openwebui(model, content, workspace_id=None):
     if workspace_id:
         headers["X-Workspace-ID"] = workspace_id
 
-    # Log request details
-    request_log = {
-        'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
-        'stage': 'API Request',
-        'url': cfg['api_url'],
-        'method': 'POST',
-        'model': model,
-        'workspace': workspace_id,
-        'headers': {
-            k: v if k != 'Authorization' else 'Bearer [REDACTED]' 
-            for k, v in headers.items()
-        },
-        'payload_size': len(json.dumps(payload)),
-        'timeout': cfg['request_timeout']
-    }
-    
-    try:
-        start_time = time.time()
-        response = requests.post(cfg['api_url'], headers=headers, json=payload, timeout=cfg['request_timeout'])
-        elapsed_time = time.time() - start_time
-        
-        response_log = {
-            'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
-            'stage': 'API Response',
-            'status_code': response.status_code,
-            'response_time_seconds': round(elapsed_time, 2),
-            'response_headers': dict(response.headers),
-            'response_size': len(response.text)
+    # Serialize once; requests would otherwise re-encode the payload itself
+    body = _dumps(payload)
+
+    def _build_request_log():
+        # Only materialized on the error paths; the happy path never
+        # pays for the header redaction copy or the log dict
+        return {
+            'timestamp': _now_str(),
+            'stage': 'API Request',
+            'url': cfg['api_url'],
+            'method': 'POST',
+            'model': model,
+            'workspace': workspace_id,
+            'headers': {
+                k: v if k != 'Authorization' else 'Bearer [REDACTED]'
+                for k, v in headers.items()
+            },
+            'payload_size': len(body),
+            'timeout': cfg['request_timeout']
         }
-        
+
+    try:
+        response = _get_session().post(cfg['api_url'], headers=headers, data=body, timeout=cfg['request_timeout'])
         response.raise_for_status()
-        data = response.json()
+        data = _loads(response.content)
         
         # Extract content from standard OpenAI format response
         content = data['choices'][0]['message']['content']
@@ -242,8 +424,8 @@ def submit_to_openwebui(model, content, workspace_id=None):
         
     except RequestException as e:
         error_log = {
-            **request_log,
-            'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
+            **_build_request_log(),
+            'timestamp': _now_str(),
             'stage': 'API Error',
             'error_type': type(e).__name__,
             'error_message': str(e),
@@ -251,10 +433,10 @@ def submit_to_openwebui(model, content, workspace_id=None):
         }
         print(f"API Error: {error_log}")
         return None, error_log
-    except (KeyError, IndexError) as e:
+    except (KeyError, IndexError, ValueError) as e:
         error_log = {
-            **request_log,
-            'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
+            **_build_request_log(),
+            'timestamp': _now_str(),
             'stage': 'Response Parsing Error',
             'error_type': type(e).__name__,
             'error_message': str(e),
@@ -300,39 +482,42 @@ def format_error_log(log_data):
 
 def generate_task_id(timestamp):
     """
-    Generates a task ID by creating a SHA256 hash of the timestamp.
-    Returns the full hash and first 6 characters.
+    Generates a task ID by hashing the timestamp with BLAKE2b,
+    which is faster than SHA-256 and needs no collision resistance
+    for a 6-character label. Returns the full hash and first 6 characters.
     """
-    hash_obj = hashlib.sha256(timestamp.encode('utf-8'))
-    full_hash = hash_obj.hexdigest()
+    full_hash = hashlib.blake2b(timestamp.encode('utf-8'), digest_size=32).hexdigest()
     short_hash = full_hash[:6]
     return full_hash, short_hash
 
+def stamp_archive_metadata(metadata, now_str=None):
+    """
+    Adds the archive timestamp and task ID to metadata in place,
+    so the final write already contains everything the archived
+    file needs and the move is a pure rename.
+    """
+    created_at = now_str or _now_str()
+    full_hash, _short_hash = generate_task_id(created_at)
+    metadata['created_at'] = created_at
+    metadata['task_id'] = full_hash
+
 def strip_acceptance_criteria(content):
     """
     Removes the Acceptance Criteria section from the content.
     Returns the content without the acceptance criteria section.
+    Two C-level find calls and a slice splice; no Python line loop.
     """
-    lines = content.split('\n')
-    result_lines = []
-    skip_section = False
-    
-    for line in lines:
-        # Check if this is the start of Acceptance Criteria section
-        if line.strip() == '## Acceptance Criteria':
-            skip_section = True
-            continue
-        
-        # If we're skipping, continue until we hit another heading
-        if skip_section:
-            if line.startswith('## ') and not line.strip() == '## Acceptance Criteria':
-                skip_section = False
-                result_lines.append(line)
-            continue
-        
-        result_lines.append(line)
-    
-    return '\n'.join(result_lines)
+    start = content.find('\n## Acceptance Criteria')
+    if start == -1:
+        if not content.startswith('## Acceptance Criteria'):
+            return content
+        start = 0
+
+    # Section runs until the next heading (kept) or end of file
+    end = content.find('\n## ', start + 1)
+    if end == -1:
+        return content[:start]
+    return content[:start] + content[end:]
 
 def parse_evaluator_response(evaluator_response):
     """
@@ -340,76 +525,93 @@ def parse_evaluator_response(evaluator_response):
     Returns tuple: (json_data, error_message)
     """
     import json
-    
-    # Try to find JSON in the response
-    # Look for JSON blocks (```json ... ```) or just raw JSON
+
+    # Fast path: the whole response is JSON
     try:
-        # Try direct JSON parse first
-        json_data = json.loads(evaluator_response)
-        return json_data, None
+        return json.loads(evaluator_response), None
     except json.JSONDecodeError:
         pass
-    
-    # Try to find JSON in code blocks
-    json_start = evaluator_response.find('```json')
-    if json_start != -1:
-        json_start += 7  # Skip '```json'
-        json_end = evaluator_response.find('```', json_start)
-        if json_end != -1:
-            json_text = evaluator_response[json_start:json_end].strip()
-            try:
-                json_data = json.loads(json_text)
-                return json_data, None
-            except json.JSONDecodeError:
-                pass
-    
-    # Try to find JSON between { and }
-    brace_start = evaluator_response.find('{')
-    if brace_start != -1:
-        brace_end = evaluator_response.rfind('}')
-        if brace_end != -1 and brace_end > brace_start:
-            json_text = evaluator_response[brace_start:brace_end + 1]
-            try:
-                json_data = json.loads(json_text)
-                return json_data, None
-            except json.JSONDecodeError:
-                pass
-    
+
+    # Prefer a fenced ```json block; fall back to the outermost braces
+    match = _JSON_FENCE_RE.search(evaluator_response)
+    if match:
+        try:
+            return json.loads(match.group(1)), None
+        except json.JSONDecodeError:
+            pass
+
+    match = _JSON_BRACE_RE.search(evaluator_response)
+    if match:
+        try:
+            return json.loads(match.group(0)), None
+        except json.JSONDecodeError:
+            pass
+
     return None, "Could not parse JSON from evaluator response"
 
-def create_subtask(original_task_name, evaluator_response, original_metadata):
+def create_subtask(original_task_name, response_content, original_metadata):
     """
-    Creates a new subtask file with the evaluator's response.
+    Queues an evaluation subtask whose content is the completed task's
+    response. The normal pending loop submits it to the evaluator
+    workspace, so completion never blocks on a second API round trip.
     Returns the filepath of the created subtask.
     """
     cfg = get_config()
     pending_directory = cfg['pending_directory']
-    
+
     # Remove 6-digit hash from original task name if present
-    import re
-    cleaned_task_name = re.sub(r'_[a-f0-9]{6}$', '', original_task_name)
-    
-    # Generate subtask filename (without _eval suffix)
+    cleaned_task_name = _HASH_SUFFIX_RE.sub('', original_task_name)
+
     timestamp = time.strftime("%Y%m%d_%H%M%S")
-    subtask_name = f"{cleaned_task_name}_{timestamp}.md"
+    subtask_name = f"{cleaned_task_name}_eval_{timestamp}.md"
     subtask_path = os.path.join(pending_directory, subtask_name)
-    
-    # Create metadata for subtask
+
+    # Create metadata for subtask; original_workspace is kept so any
+    # next-step subtasks spawned from the verdict route back correctly
     subtask_metadata = {
         'status': 'pending',
         'model': original_metadata.get('model', cfg.get('default_model', 'llama3')),
         'workspace': 'evaluator',
         'original_task': original_task_name,
-        'created_at': time.strftime("%Y-%m-%d %H:%M:%S"),
+        'original_workspace': original_metadata.get('workspace', cfg.get('default_workspace', None)),
+        'created_at': _now_str(),
         'task_type': 'evaluation'
     }
-    
-    # Write the subtask with evaluator response as content
-    write_frontmatter(subtask_path, subtask_metadata, evaluator_response)
-    
+
+    # Write the subtask with the task response as content
+    write_frontmatter(subtask_path, subtask_metadata, response_content)
+
     print(f"Created evaluation subtask: {subtask_name}")
     return subtask_path
 
+def handle_evaluator_result(task_name, evaluator_response, metadata):
+    """
+    Acts on a completed evaluation task: parses the verdict JSON and
+    creates next-step subtasks when acceptance_status is 'no'.
+    """
+    original_task_name = metadata.get('original_task', task_name)
+
+    json_data, parse_error = parse_evaluator_response(evaluator_response)
+    if not json_data:
+        print(f"Could not parse evaluator response as JSON: {parse_error}")
+        return
+
+    print("Successfully parsed evaluator response JSON")
+    acceptance_status = str(json_data.get('acceptance_status', '')).lower()
+    print(f"Acceptance status: {acceptance_status}")
+
+    if acceptance_status == 'no':
+        # Look for NEXT STEPS array
+        next_steps = json_data.get('NEXT STEPS', json_data.get('next_steps', []))
+
+        if next_steps and isinstance(next_steps, list) and len(next_steps) > 0:
+            print(f"Found {len(next_steps)} next steps. Creating subtasks...")
+            next_metadata = dict(metadata)
+            next_metadata['workspace'] = metadata.get('original_workspace', metadata.get('workspace'))
+            create_next_steps_subtasks(original_task_name, next_steps, next_metadata)
+        else:
+            print("No next steps found in evaluator response")
+
 def create_next_steps_subtasks(original_task_name, next_steps, original_metadata):
     """
     Creates subtasks for each item in the next_steps array.
@@ -420,21 +622,24 @@ def create_next_steps_subtasks(original_task_name, next_steps, original_metadata
     created_files = []
     
     # Remove 6-digit hash from original task name if present
-    import re
-    cleaned_task_name = re.sub(r'_[a-f0-9]{6}$', '', original_task_name)
-    
+    cleaned_task_name = _HASH_SUFFIX_RE.sub('', original_task_name)
+
+    # One timestamp pair for the whole batch; the step number keeps names unique
+    now = time.localtime()
+    timestamp = time.strftime("%Y%m%d_%H%M%S", now)
+    created_at = time.strftime("%Y-%m-%d %H:%M:%S", now)
+
     for i, step in enumerate(next_steps):
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
         subtask_name = f"{cleaned_task_name}_step{i+1}_{timestamp}.md"
         subtask_path = os.path.join(pending_directory, subtask_name)
-        
+
         # Create metadata for subtask
         subtask_metadata = {
             'status': 'pending',
             'model': original_metadata.get('model', cfg.get('default_model', 'llama3')),
             'workspace': original_metadata.get('workspace', cfg.get('default_workspace', None)),
             'original_task': original_task_name,
-            'created_at': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'created_at': created_at,
             'task_type': 'next_step',
             'step_number': i + 1
         }
@@ -454,8 +659,42 @@ def process_markdown_file(filepath):
     Moves failed tasks to the failed directory.
     After successful completion, sends response to evaluator workspace and creates subtask.
     """
-    print(f"--- Processing {os.path.basename(filepath)} ---")
-    
+    filename = os.path.basename(filepath)
+    print(f"--- Processing {filename} ---")
+
+    # 0. Atomically claim the file by renaming it into the in-progress
+    # directory. Exactly one worker wins the rename; any other worker
+    # (thread or process) that raced on the same file gets
+    # FileNotFoundError and skips. This replaces the old soft-lock
+    # 'running' status write, saving a full rewrite per task.
+    cfg = get_config()
+    if cfg is None:
+        print("Error: Configuration not loaded. Cannot process file.")
+        return
+
+    # Status triage on just the frontmatter: files another process
+    # marked running are skipped without reading their bodies or
+    # bouncing them through the in-progress directory
+    try:
+        if parse_frontmatter_meta_only(filepath).get('status') == 'running':
+            print("Skipping: Task currently marked as running (might be handled by another process).")
+            return
+    except OSError:
+        print("Skipping: task already claimed by another worker.")
+        return
+
+    claimed_path = os.path.join(cfg['in_progress_directory'], filename)
+    try:
+        os.replace(filepath, claimed_path)
+    except FileNotFoundError:
+        print("Skipping: task already claimed by another worker.")
+        return
+    filepath = claimed_path
+
+    # Stamp the claim time (rename keeps the file's old mtime); the
+    # stale-claim sweep in run_once relies on it to spot dead workers
+    os.utime(claimed_path)
+
     # 1. Load the file content and frontmatter
     try:
         metadata, content = parse_frontmatter(filepath)
@@ -468,16 +707,21 @@ def process_markdown_file(filepath):
     
     if current_status == 'complete':
         print("Task already marked as complete. Moving to completed folder...")
-        move_to_completed(filepath, metadata, content)
+        stamp_archive_metadata(metadata)
+        write_frontmatter(filepath, metadata, content)
+        move_to_completed(filepath, metadata)
         return
-    
+
     if current_status == 'failed':
         print("Task already marked as failed. Moving to failed folder...")
-        move_to_failed(filepath, metadata, content)
+        stamp_archive_metadata(metadata)
+        write_frontmatter(filepath, metadata, content)
+        move_to_failed(filepath, metadata)
         return
     
     if current_status == 'running':
         print("Skipping: Task currently marked as running (might be handled by another process).")
+        os.replace(filepath, os.path.join(cfg['pending_directory'], filename))
         return
 
     # 3. Strip acceptance criteria from content before sending to OpenWebUI
@@ -486,22 +730,12 @@ def process_markdown_file(filepath):
         print("Acceptance criteria section removed from request")
     
     # 4. Extract Metadata (with fallback to config defaults)
-    cfg = get_config()
     model = metadata.get('model', cfg.get('default_model', 'llama3'))
     workspace = metadata.get('workspace', cfg.get('default_workspace', None))
     criteria = metadata.get('completion_criteria')
-    
-    # 4. Update Status to 'running' immediately to prevent double execution
-    metadata['status'] = 'running'
-    metadata['last_updated'] = time.strftime("%Y-%m-%d %H:%M:%S")
-    
-    try:
-        write_frontmatter(filepath, metadata, content)
-    except Exception as e:
-        print(f"Error writing running status: {e}")
-        return
 
-    # 5. Execute Task (without acceptance criteria)
+    # 5. Execute Task (without acceptance criteria); the claim rename
+    # above already prevents double execution, no 'running' write needed
     print(f"Submitting to model '{model}' in workspace '{workspace}'...")
     llm_response, log_data = submit_to_openwebui(model, content_to_send, workspace)
 
@@ -524,9 +758,14 @@ def process_markdown_file(filepath):
         metadata['status'] = 'failed'
         metadata['failure_reason'] = 'API Request Failed'
 
-    # 7. Final Write
-    metadata['last_updated'] = time.strftime("%Y-%m-%d %H:%M:%S")
-    
+    # 7. Final Write (a single write carries the archive metadata too,
+    # so the move functions no longer rewrite the file). One strftime
+    # serves every timestamp field in this write.
+    now_str = _now_str()
+    metadata['last_updated'] = now_str
+    if metadata.get('status') in ('complete', 'failed'):
+        stamp_archive_metadata(metadata, now_str)
+
     # Store the response in the file
     response_to_write = None
     if llm_response:
@@ -540,136 +779,126 @@ def process_markdown_file(filepath):
     
     # 8. Move to appropriate folder based on status
     if metadata.get('status') == 'complete':
-        # Before moving, send response to evaluator workspace and create subtask
-        print("Sending response to evaluator workspace...")
-        original_task_name = os.path.splitext(os.path.basename(filepath))[0]
-        evaluator_response, evaluator_log = submit_to_openwebui(model, llm_response, 'evaluator')
-        
-        if evaluator_response:
-            print("Evaluator response received. Parsing response...")
-            
-            # Parse evaluator response to look for JSON with acceptance_status
-            json_data, parse_error = parse_evaluator_response(evaluator_response)
-            
-            if json_data:
-                print("Successfully parsed evaluator response JSON")
-                
-                # Check for acceptance_status
-                acceptance_status = json_data.get('acceptance_status', '').lower()
-                print(f"Acceptance status: {acceptance_status}")
-                
-                if acceptance_status == 'no':
-                    # Look for NEXT STEPS array
-                    next_steps = json_data.get('NEXT STEPS', json_data.get('next_steps', json_data.get('next_steps', [])))
-                    
-                    if next_steps and isinstance(next_steps, list) and len(next_steps) > 0:
-                        print(f"Found {len(next_steps)} next steps. Creating subtasks...")
-                        create_next_steps_subtasks(original_task_name, next_steps, metadata)
-                    else:
-                        print("No next steps found in evaluator response")
-                
-                # Always create the evaluation subtask with full response
-                create_subtask(original_task_name, evaluator_response, metadata)
-            else:
-                print(f"Could not parse evaluator response as JSON: {parse_error}")
-                # Still create subtask with raw response
-                create_subtask(original_task_name, evaluator_response, metadata)
+        task_name = os.path.splitext(os.path.basename(filepath))[0]
+
+        if metadata.get('task_type') == 'evaluation':
+            # This was an evaluator run; act on its verdict
+            handle_evaluator_result(task_name, llm_response, metadata)
         else:
-            print(f"Warning: Failed to get evaluator response: {evaluator_log.get('error_message', 'Unknown error') if evaluator_log else 'No log available'}")
-        
-        move_to_completed(filepath, metadata, content, response_to_write)
+            # Queue the evaluator as a normal pending task instead of
+            # blocking completion on a second synchronous API call;
+            # the next pass (or a concurrent worker) picks it up
+            print("Queuing response for evaluator workspace...")
+            create_subtask(task_name, llm_response, metadata)
+
+        move_to_completed(filepath, metadata)
     elif metadata.get('status') == 'failed':
-        move_to_failed(filepath, metadata, content, response_to_write)
+        move_to_failed(filepath, metadata)
+    else:
+        # Incomplete tasks go back to pending for another attempt
+        os.replace(filepath, os.path.join(cfg['pending_directory'], filename))
+
+# Whether a (source dir, dest dir) pair shares a filesystem; checked once
+_same_fs_cache = {}
 
-def move_to_completed(filepath, metadata, content, response=None):
+def _fast_move(src, dst):
+    """
+    Moves src to dst with an atomic rename when both directories share
+    a filesystem (checked once per directory pair), falling back to
+    shutil.move (copy + unlink) across devices, where rename fails.
+    """
+    key = (os.path.dirname(src), os.path.dirname(dst))
+    same_fs = _same_fs_cache.get(key)
+    if same_fs is None:
+        try:
+            same_fs = os.stat(key[0]).st_dev == os.stat(key[1]).st_dev
+        except OSError:
+            same_fs = False
+        _same_fs_cache[key] = same_fs
+
+    if same_fs:
+        os.replace(src, dst)
+    else:
+        import shutil
+        shutil.move(src, dst)
+
+def _park_terminal(filepath, name_without_ext, status, cfg):
+    """
+    Fallback when a file cannot reach its archive directory: park it in
+    pending under a status-tagged name (task.complete.md / task.failed.md)
+    so later passes filter it by filename without opening it.
+    """
+    try:
+        parked = os.path.join(cfg['pending_directory'], f"{name_without_ext}.{status}.md")
+        os.replace(filepath, parked)
+        print(f"Parked file as '{os.path.basename(parked)}' pending manual cleanup.")
+    except OSError as e:
+        print(f"Error parking file: {e}")
+
+def move_to_completed(filepath, metadata):
     """
     Moves a completed task file to the completed directory.
-    Adds task ID to metadata and filename.
+    The caller has already written the final metadata (see
+    stamp_archive_metadata), so this is a pure rename.
     """
     cfg = get_config()
     if cfg is None:
         print("Error: Configuration not loaded. Cannot move file.")
         return
-    
+
     completed_directory = cfg['completed_directory']
-    
-    # Ensure the completed directory exists
-    if not os.path.exists(completed_directory):
-        try:
-            os.makedirs(completed_directory)
-            print(f"Created directory: {completed_directory}")
-        except Exception as e:
-            print(f"Error creating completed directory: {e}")
-            return
-    
-    # Add created_at timestamp and task ID to metadata
-    created_at = time.strftime("%Y-%m-%d %H:%M:%S")
-    full_hash, short_hash = generate_task_id(created_at)
-    
-    metadata['created_at'] = created_at
-    metadata['task_id'] = full_hash
-    
-    # Rewrite the file with updated metadata, preserving response
-    write_frontmatter(filepath, metadata, content, response)
-    
+
     # Generate new filename with short hash
+    short_hash = metadata.get('task_id', '')[:6]
     filename = os.path.basename(filepath)
     name_without_ext = os.path.splitext(filename)[0]
-    new_filename = f"{name_without_ext}_{short_hash}.md"
+    new_filename = f"{name_without_ext}_{short_hash}.md" if short_hash else filename
     destination = os.path.join(completed_directory, new_filename)
-    
+
     try:
-        # Move the file with new name
-        os.rename(filepath, destination)
+        # Move the file with new name (rename when possible, copy across devices)
+        _fast_move(filepath, destination)
+        _write_cache.pop(filepath, None)
         print(f"Moved '{filename}' to completed folder as '{new_filename}'.")
     except Exception as e:
         print(f"Error moving file to completed folder: {e}")
+        _park_terminal(filepath, name_without_ext, 'complete', cfg)
 
-def move_to_failed(filepath, metadata, content, response=None):
+def move_to_failed(filepath, metadata):
     """
     Moves a failed task file to the failed directory.
-    Adds task ID to metadata and filename.
+    The caller has already written the final metadata (see
+    stamp_archive_metadata), so this is a pure rename.
     """
     cfg = get_config()
     if cfg is None:
         print("Error: Configuration not loaded. Cannot move file.")
         return
-    
+
     failed_directory = cfg['failed_directory']
-    
-    # Ensure the failed directory exists
-    if not os.path.exists(failed_directory):
-        try:
-            os.makedirs(failed_directory)
-            print(f"Created directory: {failed_directory}")
-        except Exception as e:
-            print(f"Error creating failed directory: {e}")
-            return
-    
-    # Add created_at timestamp and task ID to metadata
-    created_at = time.strftime("%Y-%m-%d %H:%M:%S")
-    full_hash, short_hash = generate_task_id(created_at)
-    
-    metadata['created_at'] = created_at
-    metadata['task_id'] = full_hash
-    
-    # Rewrite the file with updated metadata, preserving response
-    write_frontmatter(filepath, metadata, content, response)
-    
+
     # Generate new filename with short hash
+    short_hash = metadata.get('task_id', '')[:6]
     filename = os.path.basename(filepath)
     name_without_ext = os.path.splitext(filename)[0]
-    new_filename = f"{name_without_ext}_{short_hash}.md"
+    new_filename = f"{name_without_ext}_{short_hash}.md" if short_hash else filename
     destination = os.path.join(failed_directory, new_filename)
-    
+
     try:
-        # Move the file with new name
-        os.rename(filepath, destination)
+        # Move the file with new name (rename when possible, copy across devices)
+        _fast_move(filepath, destination)
+        _write_cache.pop(filepath, None)
         print(f"Moved '{filename}' to failed folder as '{new_filename}'.")
     except Exception as e:
         print(f"Error moving file to failed folder: {e}")
+        _park_terminal(filepath, name_without_ext, 'failed', cfg)
 
-def main():
+def run_once():
+    """
+    Runs a single orchestration pass over the pending directory.
+    Callable from other processes (e.g. the web dashboard) without
+    spawning a new interpreter.
+    """
     # Load configuration
     cfg = get_config()
     if cfg is None:
@@ -684,36 +913,76 @@ def main():
         print(f"Directory '{pending_directory}' not found.")
         return
 
-    # Ensure the completed directory exists
-    if not os.path.exists(completed_directory):
-        try:
-            os.makedirs(completed_directory)
-            print(f"Created directory: {completed_directory}")
-        except Exception as e:
-            print(f"Error creating completed directory: {e}")
-            return
-    
-    # Ensure the failed directory exists
-    if not os.path.exists(failed_directory):
-        try:
-            os.makedirs(failed_directory)
-            print(f"Created directory: {failed_directory}")
-        except Exception as e:
-            print(f"Error creating failed directory: {e}")
-            return
+    # Ensure the target directories exist (memoized, so repeated passes
+    # in one process cost nothing); the move functions rely on this
+    # instead of re-checking per task
+    try:
+        for directory in (completed_directory, failed_directory, cfg['in_progress_directory']):
+            _ensure_dir(directory)
+    except Exception as e:
+        print(f"Error creating task directories: {e}")
+        return
+
+    # Re-queue stale claims: a worker that dies mid-task leaves its file
+    # in the in-progress directory, which nothing else ever rescans.
+    # The threshold must exceed a healthy claim's worst case: the shared
+    # session retries POSTs (Retry total=3, so up to 4 attempts of a
+    # full request_timeout each, plus backoff) — sweeping earlier would
+    # re-queue a live claim and run the task twice. 6x leaves slack.
+    stale_before = time.time() - cfg['request_timeout'] * 6
+    try:
+        with os.scandir(cfg['in_progress_directory']) as entries:
+            for entry in entries:
+                if not (entry.is_file() and entry.name.endswith('.md')):
+                    continue
+                if entry.stat().st_mtime >= stale_before:
+                    continue
+                requeued = os.path.join(pending_directory, entry.name)
+                if os.path.exists(requeued):
+                    stem, ext = os.path.splitext(entry.name)
+                    requeued = os.path.join(pending_directory, f"{stem}_requeued{ext}")
+                try:
+                    os.replace(entry.path, requeued)
+                    print(f"Re-queued stale in-progress task: {entry.name}")
+                except OSError as e:
+                    print(f"Error re-queuing stale task '{entry.name}': {e}")
+    except OSError as e:
+        print(f"Error scanning in-progress directory: {e}")
+
+    # Get all .md files in the pending directory; scandir hands back
+    # DirEntry objects with the path and cached file type in one pass
+    # (status-tagged names parked by _park_terminal are filtered out
+    # here, so stale terminal files cost nothing after their first pass)
+    with os.scandir(pending_directory) as entries:
+        md_files = [
+            entry.path for entry in entries
+            if entry.is_file() and entry.name.endswith(".md")
+            and '.complete.' not in entry.name and '.failed.' not in entry.name
+        ]
 
-    # Get all .md files in the pending directory
-    md_files = [filename for filename in os.listdir(pending_directory) if filename.endswith(".md")]
-    
     # Check if there are any pending tasks
     if not md_files:
         print("No pending tasks found in the pending directory.")
         return
 
-    # Iterate over all .md files in the pending directory
-    for filename in md_files:
-        filepath = os.path.join(pending_directory, filename)
-        process_markdown_file(filepath)
+    # Order tasks so ones sharing (model, workspace) run back to back:
+    # consecutive submissions reuse the same keep-alive socket and keep
+    # the server's loaded model warm. The chat/completions endpoint has
+    # no multi-task batch format, so grouping is the practical version.
+    def _group_key(path):
+        try:
+            meta = parse_frontmatter_meta_only(path)
+        except OSError:
+            return ('', '')
+        return (str(meta.get('model', '')), str(meta.get('workspace', '')))
+
+    md_files.sort(key=_group_key)
+
+    # Process tasks on a bounded thread pool: each file is independent
+    # and the hot path is a blocking LLM request, so network waits overlap
+    max_workers = min(cfg.get('max_workers', 4), len(md_files))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(process_markdown_file, md_files))
 
 if __name__ == "__main__":
-    main()
+    run_once()
@@ -0,0 +1,10 @@
+"""
+WSGI entry point for running the dashboard under a production server.
+
+Example:
+    gunicorn -k gthread --threads 8 --workers 2 wsgi:app
+"""
+from app import app
+
+if __name__ == "__main__":
+    app.run(host='0.0.0.0', port=5001)